@@ -1,48 +1,26 @@
 import os
 import re
+import argparse
 import subprocess
-import tarfile
 import sys
 import json
-from datetime import datetime
-import math
-import tempfile
+import glob
+import random
 import base64
 import shutil
 import getpass
 import time
 import stat
+import queue
+import atexit
 import logging
+import threading
+import hashlib
+import concurrent.futures
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 
-def check_and_install_packages():
-    """Function to check for necessary packages and install them if missing."""
-    missing_packages = []
-    necessary_packages = [
-        "os", "re", "subprocess", "tarfile", "sys", "json",
-        "datetime", "math", "tempfile", "base64", "shutil",
-        "getpass", "time", "stat", "logging"]
-
-    for package in necessary_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
-
-    if missing_packages:
-        install = input(f"The following packages are missing: {missing_packages}. Do you want to install them? Yes/no (default is Yes): ").strip().lower()
-        if install in ('', 'y', 'yes'):
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing_packages)
-            except subprocess.CalledProcessError as e:
-                logging.error(f"Failed to install packages: {e}")
-                sys.exit(1)
-        else:
-            logging.info("Installation aborted by the user.")
-            sys.exit(1)
-
 # Configuration: Black Duck versions supported by this script
 black_duck_versions = ["2024.7.0", "2024.4.1", "2024.4.0", "2024.1.1", "2024.1.0", 
                        "2023.10.2", "2023.10.1", "2023.10.0", "2023.7.3", "2023.7.2", 
@@ -50,73 +28,141 @@ black_duck_versions = ["2024.7.0", "2024.4.1", "2024.4.0", "2024.1.1", "2024.1.0
                        "2023.1.2", "2023.1.1", "2023.1.0"]
 
 # Required command-line tools
-REQUIRED_TOOLS = ["curl", "docker", "tar", "7z"]
+REQUIRED_TOOLS = ["curl", "docker", "git"]
+
+# Frozen set for O(1) membership tests; sorted once at import for the listing
+BLACK_DUCK_VERSIONS = frozenset(black_duck_versions)
+_SORTED_VERSIONS = sorted(black_duck_versions, reverse=True)
+
+# Timestamp format for log entries
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+# Pre-compiled regex patterns (compiled once at import time)
+_VERSION_RE = re.compile(r"(\d{4}\.\d\.\d)$")
+_IMAGE_LINE_RE = re.compile(rb"^\s*image:\s*(\S+)", re.M)
+_IMAGE_KIND_RE = re.compile(r"bdba-worker|rl-service|ubi")
+_IMAGE_REF_RE = re.compile(r"(?P<registry>[\w./-]+)/(?P<name>[\w.-]+):(?P<tag>[\w.-]+)$")
 
-# Log output dictionary to store logs
-output = {
-    'logs': [],
-}
+def parse_image(ref):
+    """Split an image reference into (registry, name, tag) in a single pass."""
+    match = _IMAGE_REF_RE.match(ref)
+    if not match:
+        return None
+    return match.group("registry"), match.group("name"), match.group("tag")
+
+# Append-only JSON Lines log file (one JSON object per line), opened once
+# so each log entry is a single O(1) write instead of a full-file rewrite.
+# A 64 KiB buffer batches entries between flushes; atexit drains it on exit.
+_LOG_FP = open("logfile.jsonl", "a", buffering=1 << 16)
+atexit.register(_LOG_FP.close)
+
+# Entries are handed to a daemon writer thread through this queue so log()
+# never blocks the orchestration path on disk I/O. Entries are dropped
+# rather than blocking if the queue somehow fills up. The writer also keeps
+# the full history in memory so logfile.json can be written exactly once at
+# shutdown instead of being rewritten per entry; the JSONL sidecar remains
+# the crash-safe record.
+_LOG_QUEUE = queue.Queue(maxsize=20000)
+_LOG_SENTINEL = object()
+_LOG_HISTORY = []
+
+def _log_writer():
+    """Drain the log queue to the JSONL file, flushing during idle periods."""
+    while True:
+        try:
+            entry = _LOG_QUEUE.get(timeout=1.0)
+        except queue.Empty:
+            _LOG_FP.flush()
+            continue
+        if entry is _LOG_SENTINEL:
+            _LOG_FP.flush()
+            return
+        _LOG_HISTORY.append(entry)
+        _LOG_FP.write(json.dumps(entry, separators=(',', ':')) + "\n")
+
+_LOG_THREAD = threading.Thread(target=_log_writer, daemon=True)
+_LOG_THREAD.start()
+
+def _stop_log_writer():
+    """Finish the writer thread, then write the aggregate logfile.json once."""
+    _LOG_QUEUE.put(_LOG_SENTINEL)
+    _LOG_THREAD.join(timeout=5)
+    try:
+        # Write to a temp file and swap it in atomically so an interrupted
+        # shutdown cannot corrupt a previous run's good logfile.json.
+        with open("logfile.json.tmp", "w") as outfile:
+            json.dump({'logs': _LOG_HISTORY}, outfile, indent=4)
+        os.replace("logfile.json.tmp", "logfile.json")
+    except OSError:
+        pass
+
+# Registered after _LOG_FP.close so it runs first (atexit is LIFO): the
+# queue is drained before the file handle is closed.
+atexit.register(_stop_log_writer)
 
 def log(level, message):
-    """Append new log entries to the output dictionary and log using logging module."""
+    """Queue a log entry for the JSON Lines logfile and log using logging module."""
     entry = {
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'timestamp': time.strftime(_TS_FMT),
         'level': level,
         'message': message
     }
-    output['logs'].append(entry)
-    with open("logfile.json", "w") as outfile:
-        json.dump(output, outfile, indent=4)
+    try:
+        _LOG_QUEUE.put_nowait(entry)
+    except queue.Full:
+        pass
     if level == 'INFO':
         logging.info(message)
     elif level == 'ERROR':
         logging.error(message)
 
+# Cache directory for tool probes and per-version image lists.
+_CACHE_DIR = os.path.expanduser("~/.cache/oic")
+_TOOL_CACHE_MAX_AGE = 24 * 60 * 60  # one day
+
+def _tool_cache_path():
+    """Return the tool-probe cache file for the current PATH."""
+    key = hashlib.sha1(os.environ.get("PATH", "").encode()).hexdigest()
+    return os.path.join(_CACHE_DIR, f"tools-{key}.json")
+
 def check_required_tools():
     """Check if the required command-line tools are available in the system's PATH."""
+    cache_path = _tool_cache_path()
+    try:
+        if time.time() - os.path.getmtime(cache_path) < _TOOL_CACHE_MAX_AGE:
+            with open(cache_path, 'r') as file:
+                available_tools = json.load(file)
+            log('INFO', "All required command-line tools are installed (cached result).")
+            return available_tools
+    except (OSError, ValueError):
+        pass
+
     missing_tools = []
     available_tools = []
     for tool in REQUIRED_TOOLS:
-        try:
-            if tool == "7z":
-                result = subprocess.run([tool], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                if "7-Zip" in result.stdout.decode() or "7-Zip" in result.stderr.decode():
-                    available_tools.append(tool)
-                else:
-                    missing_tools.append(tool)
-            else:
-                subprocess.run([tool, "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                available_tools.append(tool)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if shutil.which(tool):
+            available_tools.append(tool)
+        else:
             missing_tools.append(tool)
-    
+
+
     if missing_tools:
         log('ERROR', f"Missing required tools: {', '.join(missing_tools)}. Please install them and try again.")
         sys.exit(1)
     else:
         log('INFO', "All required command-line tools are installed.")
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w') as file:
+            json.dump(available_tools, file)
+    except OSError as e:
+        log('ERROR', f"Failed to write tool cache: {e}")
     return available_tools
 
-def prompt_archive_tool(available_tools):
-    """Prompt the user to select an archive tool if both 'tar' and '7z' are available."""
-    if "tar" in available_tools and "7z" in available_tools:
-        choice = input("Both 'tar' and '7z' are available. Which one would you like to use for creating the archive? (tar/7z) (default is tar): ").strip().lower()
-        if choice not in ["tar", "7z"]:
-            log('INFO', "Invalid choice. Defaulting to 'tar'.")
-            return "tar"
-        return choice
-    elif "tar" in available_tools:
-        return "tar"
-    elif "7z" in available_tools:
-        return "7z"
-    else:
-        log('ERROR', "Neither 'tar' nor '7z' is available. Please install at least one of them and try again.")
-        sys.exit(1)
-
 def normalize_version_input(user_input):
     """Validate and normalize user input for the version number."""
     log('INFO', "Validating the user input for the version number.")
-    match = re.match(r"(\d{4}\.\d\.\d)", user_input)
+    match = _VERSION_RE.match(user_input)
     if match:
         return match.group(1)
     else:
@@ -126,19 +172,8 @@ def normalize_version_input(user_input):
 def display_versions():
     """Display available versions in multiple columns in descending order."""
     log('INFO', "Displaying available versions in multiple columns.")
-    versions_list = sorted(black_duck_versions, reverse=True)
-    column_count = 4
-    row_count = math.ceil(len(versions_list) / column_count)
-    columns = [[] for _ in range(column_count)]
-
-    for i, version in enumerate(versions_list):
-        columns[i % column_count].append(version)
-
-    for row in range(row_count):
-        for col in range(column_count):
-            if row < len(columns[col]):
-                print(f"{columns[col][row]:<15}", end=' ')
-        print()
+    rows = [_SORTED_VERSIONS[i:i + 4] for i in range(0, len(_SORTED_VERSIONS), 4)]
+    sys.stdout.write("\n".join(" ".join(f"{v:<15}" for v in row) for row in rows) + "\n")
 
 def handle_remove_readonly(func, path, exc_info):
     """Change the file to be writable and reattempt removal."""
@@ -146,65 +181,114 @@ def handle_remove_readonly(func, path, exc_info):
     func(path)
 
 def clean_up():
-    """Clean up hub directory and images file if they exist."""
-    if os.path.exists("hub"):
-        try:
+    """Clean up hub directory if it exists."""
+    try:
+        if os.name == "posix":
+            # rm -rf removes the thousands of small git object files far
+            # faster than per-file unlink calls from Python, and is a no-op
+            # when the directory is already gone.
+            subprocess.run(["rm", "-rf", "hub"], check=True)
+        else:
             shutil.rmtree("hub", onerror=handle_remove_readonly)
-            log('INFO', "Removed 'hub' directory.")
-        except Exception as e:
-            log('ERROR', f"Failed to remove 'hub' directory: {e}")
-    
-    if os.path.exists("images"):
-        try:
-            os.remove("images")
-            log('INFO', "Removed 'images' file.")
-        except Exception as e:
-            log('ERROR', f"Failed to remove 'images' file: {e}")
+        log('INFO', "Removed 'hub' directory.")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log('ERROR', f"Failed to remove 'hub' directory: {e}")
 
 def clone_hub_repo(version):
     """Clone the specified version of the Black Duck Hub repository."""
     log('INFO', f"Cloning Black Duck Hub repository for version {version}.")
     try:
         subprocess.run(["git", "config", "--global", "advice.detachedHead", "false"], check=True)
-        subprocess.run(["git", "clone", "--branch", f"v{version}", "https://github.com/blackducksoftware/hub.git"], check=True)
+        # Only docker-swarm/*.yml at the tag is needed, so a shallow blobless
+        # sparse clone fetches a few MB instead of the full history.
+        subprocess.run(["git", "clone", "--depth=1", "--filter=blob:none", "--sparse",
+                        "--branch", f"v{version}", "https://github.com/blackducksoftware/hub.git"], check=True)
+        subprocess.run(["git", "-C", "hub", "sparse-checkout", "set", "docker-swarm"], check=True)
         log('INFO', f"Successfully cloned Black Duck Hub repository for version {version}.")
     except subprocess.CalledProcessError as e:
         log('ERROR', f"Failed to clone Black Duck Hub repository: {e}")
         sys.exit(1)
 
+def get_image_names(version):
+    """Return the image list for a version, cloning only on a cache miss.
+
+    The image set for a released tag never changes, so the extracted list is
+    cached in ~/.cache/oic/<version>.json and re-runs skip the clone and
+    parse entirely.
+    """
+    cache_path = os.path.join(_CACHE_DIR, f"{version}.json")
+    try:
+        with open(cache_path, 'r') as file:
+            images = json.load(file)
+        log('INFO', f"Using cached image list for version {version}.")
+        return images
+    except (OSError, ValueError):
+        pass
+
+    clone_hub_repo(version)
+    images = extract_image_names()
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w') as file:
+            json.dump(images, file)
+    except OSError as e:
+        log('ERROR', f"Failed to write image list cache: {e}")
+    return images
+
 def extract_image_names():
     """Extract image names from the cloned Black Duck Hub repository."""
     log('INFO', "Extracting image names from the cloned Black Duck Hub repository.")
-    try:
-        cmd = "grep -R 'image' hub/docker-swarm/*.yml | awk '{print $3}' | sort | uniq > images"
-        subprocess.run(cmd, shell=True, check=True)
-        with open('images', 'r') as file:
-            images = file.read().strip().split('\n')
-        return images
-    except subprocess.CalledProcessError as e:
-        log('ERROR', f"Failed to extract image names: {e}")
+    images = set()
+    for yml_file in glob.glob("hub/docker-swarm/*.yml"):
+        with open(yml_file, 'rb') as file:
+            for match in _IMAGE_LINE_RE.finditer(file.read()):
+                images.add(match.group(1).decode())
+    if not images:
+        log('ERROR', "Failed to extract image names: no image entries found in hub/docker-swarm/*.yml.")
         sys.exit(1)
+    return sorted(images)
 
 def filter_images(images, bdba_needed, rl_needed, ubi_needed):
     """Filter images based on user input."""
     log('INFO', "Filtering images based on user input.")
-    filtered_images = []
+    # Classify each image in one regex pass, then select by kind: extras only
+    # when asked for, and the core (non-UBI) set only when UBI images are not
+    # replacing it.
+    wanted = {
+        "bdba-worker": bdba_needed,
+        "rl-service": rl_needed,
+        "ubi": ubi_needed,
+        "core": not ubi_needed,
+    }
+    classified = []
     for image in images:
-        if bdba_needed and "bdba-worker" in image:
-            filtered_images.append(image)
-        elif rl_needed and "rl-service" in image:
-            filtered_images.append(image)
-        elif ubi_needed and "ubi" in image:
-            filtered_images.append(image)
-        elif not ubi_needed and "ubi" not in image:
-            if "bdba-worker" not in image and "rl-service" not in image:
-                filtered_images.append(image)
-    return filtered_images
-
-def create_docker_config():
+        match = _IMAGE_KIND_RE.search(image)
+        classified.append((image, match.group(0) if match else "core"))
+    return [image for image, kind in classified if wanted[kind]]
+
+def parse_args():
+    """Parse command-line arguments; every flag is optional and skips its prompt."""
+    parser = argparse.ArgumentParser(
+        description="Pull Black Duck images and archive them for transfer to an offline server.")
+    parser.add_argument("--version", metavar="VERSION",
+                        help="Black Duck version to use, e.g. 2024.7.0 (skips the version prompt)")
+    parser.add_argument("--bdba", action="store_true", help="include the BDBA worker container")
+    parser.add_argument("--rl", action="store_true", help="include the Reversing Labs container")
+    parser.add_argument("--ubi", action="store_true", help="pull hardened UBI images from Iron Bank")
+    parser.add_argument("--ironbank-user", metavar="USER",
+                        help="Iron Bank username (with --ironbank-pass-env, skips the credential prompts)")
+    parser.add_argument("--ironbank-pass-env", metavar="ENVVAR",
+                        help="name of an environment variable holding the Iron Bank CLI secret")
+    return parser.parse_args()
+
+def create_docker_config(username=None, password=None):
     """Create docker-config.json with Iron Bank credentials."""
-    username = input("Enter your Iron Bank username: ")
-    password = getpass.getpass("Enter your Iron Bank CLI secret: ")
+    if username is None:
+        username = input("Enter your Iron Bank username: ")
+    if password is None:
+        password = getpass.getpass("Enter your Iron Bank CLI secret: ")
 
     credentials = f"{username}:{password}"
     encoded_credentials = base64.b64encode(credentials.encode()).decode()
@@ -228,18 +312,17 @@ def iron_bank_login():
     """Authenticate to the Iron Bank registry using the docker-config.json file."""
     log('INFO', "Authenticating to Iron Bank registry using docker-config.json.")
     try:
-        with tempfile.TemporaryDirectory() as temp_config_dir:
-            temp_config_file_path = os.path.join(temp_config_dir, 'config.json')
-            
-            with open(temp_config_file_path, "w") as temp_config_file:
-                with open("docker-config.json", "r") as file:
-                    docker_config = json.load(file)
-                temp_config_file.write(json.dumps(docker_config))
-
-            cmd = f"docker --config {temp_config_dir} login registry1.dso.mil"
-            result = subprocess.run(cmd, shell=True, check=True, capture_output=True, text=True)
-            log('INFO', "Successfully logged into Iron Bank registry using docker-config.json.")
-            print(result.stdout)
+        # docker expects the file to be named config.json inside the --config
+        # directory, so copy it into place byte-for-byte; no need to parse and
+        # re-serialize it or to rebuild the directory on every login.
+        config_dir = os.path.join(_CACHE_DIR, "docker")
+        os.makedirs(config_dir, exist_ok=True)
+        shutil.copyfile("docker-config.json", os.path.join(config_dir, "config.json"))
+
+        result = subprocess.run(["docker", "--config", config_dir, "login", "registry1.dso.mil"],
+                                check=True, capture_output=True, text=True)
+        log('INFO', "Successfully logged into Iron Bank registry using docker-config.json.")
+        print(result.stdout)
 
     except subprocess.CalledProcessError as e:
         log('ERROR', f"Failed to log into Iron Bank registry: {e}")
@@ -248,117 +331,141 @@ def iron_bank_login():
         log('ERROR', f"Error loading docker-config.json: {e}")
         sys.exit(1)
 
+def _pull_one(image, registry, retries, delay):
+    """Pull a single image with retries; return its final name or None on failure."""
+    if registry and "ubi" in image:
+        parsed = parse_image(image)
+        if parsed:
+            _, name, tag = parsed
+            image = f"{registry}/synopsys/blackduck/{name}:{tag}"
+    # A local inspect is far cheaper than a registry round-trip; tags are
+    # version-pinned, so an image that is already present needs no pull.
+    inspect = subprocess.run(["docker", "image", "inspect", image],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if inspect.returncode == 0:
+        log('INFO', f"Skipping pull of {image}: already present locally.")
+        return image
+    for attempt in range(retries):
+        try:
+            log('INFO', f"Pulling image: {image}")
+            print(f"Running command: docker pull {image}")
+            subprocess.run(["docker", "image", "pull", image], check=True, capture_output=True)
+            log('INFO', f"Successfully pulled {image}")
+            return image
+        except subprocess.CalledProcessError as e:
+            # Output is captured as bytes; only the failure path needs text.
+            stderr = (e.stderr or b"").decode(errors="replace").strip()
+            # Auth and missing-image errors won't fix themselves; don't retry.
+            if "unauthorized" in stderr.lower() or "not found" in stderr.lower():
+                log('ERROR', f"Failed to pull image {image}: {stderr}. Not retrying.")
+                return None
+            if attempt + 1 < retries:
+                backoff = min(delay * 2 ** attempt, 30) + random.uniform(0, 1)
+                log('ERROR', f"Failed to pull image {image}: {stderr or e}. Attempt {attempt + 1} of {retries}. Retrying in {backoff:.1f} seconds...")
+                time.sleep(backoff)
+    log('ERROR', f"Failed to pull image {image} after {retries} attempts.")
+    return None
+
 def pull_images(images, registry=None, retries=3, delay=5):
-    """Pull images from the specified registry or Docker Hub with retry logic."""
+    """Pull images concurrently from the specified registry or Docker Hub with retry logic."""
     log('INFO', f"Pulling images from {'Iron Bank registry' if registry else 'Docker Hub'}.")
     pulled_images = []
-    for image in images:
-        attempt = 0
-        while attempt < retries:
-            try:
-                if registry and "ubi" in image:
-                    image_name = image.split('/')[-1]
-                    tag = image.split(':')[-1]
-                    image = f"{registry}/synopsys/blackduck/{image_name.split(':')[0]}:{tag}"
-                log('INFO', f"Pulling image: {image}")
-                print(f"Running command: docker pull {image}")
-                subprocess.run(["docker", "image", "pull", image], check=True)
-                log('INFO', f"Successfully pulled {image}")
-                pulled_images.append(image)
-                break
-            except subprocess.CalledProcessError as e:
-                attempt += 1
-                log('ERROR', f"Failed to pull image {image}: {e}. Attempt {attempt} of {retries}. Retrying in {delay} seconds...")
-                time.sleep(delay)
-        else:
-            log('ERROR', f"Failed to pull image {image} after {retries} attempts.")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, max(1, len(images)))) as executor:
+        futures = [executor.submit(_pull_one, image, registry, retries, delay) for image in images]
+        for future in concurrent.futures.as_completed(futures):
+            pulled = future.result()
+            if pulled:
+                pulled_images.append(pulled)
     return pulled_images
 
-def save_images_to_tar(images):
-    """Save pulled images to tar files."""
-    log('INFO', "Saving pulled images to tar files.")
-    try:
-        for image in images:
-            image_name = image.split(':')[0].split('/')[-1]
-            tag = image.split(':')[-1]
-            tar_file = f"{image_name}_{tag}.tar"
-            log('INFO', f"Saving image {image} to {tar_file}")
-            subprocess.run(["docker", "image", "save", image, "-o", tar_file], check=True)
-            log('INFO', f"Successfully saved {image} to {tar_file}")
-    except subprocess.CalledProcessError as e:
-        log('ERROR', f"Failed to save image to tar: {e}")
-    except Exception as e:
-        log('ERROR', f"Unexpected error while saving images to tar: {e}")
+def save_and_archive(images):
+    """Save all pulled images into a single uncompressed images.tar.
 
-def create_tarball(archive_tool):
-    """Create a tarball of all saved images using the specified archive tool."""
-    log('INFO', f"Creating a tarball of all saved images using {archive_tool}.")
+    Docker image layers are already gzip-compressed blobs, so compressing the
+    archive again burns CPU for almost no size reduction; a plain tar keeps
+    the save step I/O-bound and loads directly with 'docker load'.
+    """
+    log('INFO', f"Saving {len(images)} images into images.tar.")
     try:
-        if archive_tool == 'tar':
-            with tarfile.open('images.tar.gz', 'w:gz') as tar:
-                for tar_file in os.listdir('.'):
-                    if tar_file.endswith('.tar'):
-                        log('INFO', f"Adding {tar_file} to images.tar.gz")
-                        tar.add(tar_file)
-            log('INFO', "Successfully created images.tar.gz")
-        elif archive_tool == '7z':
-            cmd = "7z a -ttar -so images.tar " + " ".join([f for f in os.listdir('.') if f.endswith('.tar')]) + " | 7z a -si images.tar.gz"
-            subprocess.run(cmd, shell=True, check=True)
-            log('INFO', "Successfully created images.tar.gz")
-    except Exception as e:
-        log('ERROR', f"Error creating archive with {archive_tool}: {e}")
+        subprocess.run(["docker", "image", "save", "-o", "images.tar"] + images, check=True)
+        log('INFO', "Successfully created images.tar")
+    except subprocess.CalledProcessError as e:
+        log('ERROR', f"Failed to save images to images.tar: {e}")
 
 def docker_config_exists():
     """Check if docker-config.json already exists."""
-    return os.path.exists("docker-config.json")
+    try:
+        os.stat("docker-config.json")
+        return True
+    except FileNotFoundError:
+        return False
 
 def main():
+    args = parse_args()
     print("Starting the Black Duck image management script.")
-    print("\nStep 1: Checking for required packages and tools.")
-    check_and_install_packages()
-    log('INFO', "Step 1: Checking for required packages and tools.")
-    print("All required packages are installed.")
-    log('INFO', "All required packages are installed.")
-    available_tools = check_required_tools()
+    print("\nStep 1: Checking for required tools.")
+    log('INFO', "Step 1: Checking for required tools.")
+    check_required_tools()
     print("All required command-line tools are installed.")
     log('INFO', "All required command-line tools are installed.")
 
     clean_up()
 
-    while True:
-        print("\nStep 2: Enter the version number (e.g., '2024.7.0') or 'list' to see available versions:")
-        log('INFO', "Step 2: Prompting user for version number or list command.")
-        user_input = input("Enter the version number (e.g., '2024.7.0') or 'list' to see available versions (default is '2024.7.0'):\n").strip()
-        
-        if user_input.lower() == 'list':
-            display_versions()
-            continue
+    if args.version:
+        version = normalize_version_input(args.version)
+        if not version or version not in BLACK_DUCK_VERSIONS:
+            log('ERROR', f"Invalid or unsupported version: {args.version}")
+            print(f"Invalid or unsupported version: {args.version}")
+            sys.exit(1)
+        log('INFO', f"Step 2: Using version {version} from the command line.")
+    else:
+        while True:
+            print("\nStep 2: Enter the version number (e.g., '2024.7.0') or 'list' to see available versions:")
+            log('INFO', "Step 2: Prompting user for version number or list command.")
+            user_input = input("Enter the version number (e.g., '2024.7.0') or 'list' to see available versions (default is '2024.7.0'):\n").strip()
 
-        version = normalize_version_input(user_input) if user_input else '2024.7.0'
-        
-        if not version or version not in black_duck_versions:
-            log('ERROR', f"Invalid or unsupported version input. Please try again.")
-            print(f"Invalid or unsupported version input. Please try again.")
-            continue
+            if user_input.lower() == 'list':
+                display_versions()
+                continue
+
+            version = normalize_version_input(user_input) if user_input else '2024.7.0'
 
-        print(f"\nObtaining image names and versions based on your selection of Black Duck v{version}.")
-        log('INFO', f"Obtaining image names and versions based on your selection of Black Duck v{version}.")
-        clone_hub_repo(version)
-        images = extract_image_names()
-        break
+            if not version or version not in BLACK_DUCK_VERSIONS:
+                log('ERROR', f"Invalid or unsupported version input. Please try again.")
+                print(f"Invalid or unsupported version input. Please try again.")
+                continue
+            break
+
+    print(f"\nObtaining image names and versions based on your selection of Black Duck v{version}.")
+    log('INFO', f"Obtaining image names and versions based on your selection of Black Duck v{version}.")
+    images = get_image_names(version)
 
     print("\nStep 3: Asking about 'extra' images required.")
     log('INFO', "Step 3: Asking about 'extra' images required.")
-    bdba_needed = input("Do you need the BDBA container? (yes/no) (default is no): ").strip().lower() in ['yes', 'y']
-    rl_needed = input("Do you need the Reversing Labs container? (yes/no) (default is no): ").strip().lower() in ['yes', 'y']
-    ubi_needed = input("Do you need UBI images? (yes/no) (default is no): ").strip().lower() in ['yes', 'y']
-    
+    if args.bdba or args.rl or args.ubi:
+        bdba_needed, rl_needed, ubi_needed = args.bdba, args.rl, args.ubi
+    elif args.version:
+        # A version flag signals an unattended run; don't stop to ask.
+        bdba_needed = rl_needed = ubi_needed = False
+    else:
+        extras_input = input("Extras needed, comma-separated from bdba,rl,ubi (default is none): ").strip().lower()
+        extras = {item.strip() for item in extras_input.split(',') if item.strip()}
+        bdba_needed = 'bdba' in extras
+        rl_needed = 'rl' in extras
+        ubi_needed = 'ubi' in extras
+
     filtered_images = filter_images(images, bdba_needed, rl_needed, ubi_needed)
     expected_image_count = len(filtered_images)
     log('INFO', f"Expected number of images to pull: {expected_image_count}")
     
     if ubi_needed:
-        if docker_config_exists():
+        if args.ironbank_user and args.ironbank_pass_env:
+            secret = os.environ.get(args.ironbank_pass_env)
+            if secret is None:
+                log('ERROR', f"Environment variable {args.ironbank_pass_env} is not set.")
+                sys.exit(1)
+            create_docker_config(args.ironbank_user, secret)
+        elif docker_config_exists():
             print("docker-config.json already exists.")
             log('INFO', "docker-config.json already exists.")
             use_existing_config = input("Do you want to use the existing docker-config.json? (yes/no) (default is yes): ").strip().lower()
@@ -377,29 +484,21 @@ def main():
     actual_image_count = len(pulled_images)
     log('INFO', f"Actual number of images pulled: {actual_image_count}")
 
-    print("\nStep 5: Saving images to tar files.")
-    log('INFO', "Step 5: Saving images to tar files.")
-    save_images_to_tar(pulled_images)
-
-    archive_tool = prompt_archive_tool(available_tools)
-
-    print(f"\nStep 6: Creating {archive_tool} archive.")
-    log('INFO', f"Step 6: Creating {archive_tool} archive.")
-    create_tarball(archive_tool)
+    print("\nStep 5: Saving images into images.tar.")
+    log('INFO', "Step 5: Saving images into images.tar.")
+    save_and_archive(pulled_images)
 
     clean_up()
 
-    print("\nStep 7: Providing user notes.")
-    log('INFO', "Step 7: Providing user notes.")
-    log('INFO', "Note: Move the tarball (images.tar.gz) to the target server using a jump box.")
-    log('INFO', "Once on the target server, untar the tarball using: 'tar xvf images.tar.gz'")
-    print("Note: Move the tarball (images.tar.gz) to the target server using a jump box.")
-    print("Once on the target server, untar the tarball using: 'tar xvf images.tar.gz'")
-
-    log('INFO', "You do not need to untar the individual images as Docker can load them as .tar archives.")
-    log('INFO', "Load the images with the command: for i in $(ls *.tar); do docker load -i $i; done")
-    print("You do not need to untar the individual images as Docker can load them as .tar archives.")
-    print("Load the images with the command: for i in $(ls *.tar); do docker load -i $i; done")
+    print("\nStep 6: Providing user notes.")
+    log('INFO', "Step 6: Providing user notes.")
+    log('INFO', "Note: Move the archive (images.tar) to the target server using a jump box.")
+    print("Note: Move the archive (images.tar) to the target server using a jump box.")
+
+    log('INFO', "You do not need to untar the archive as Docker can load it directly.")
+    log('INFO', "Load the images with the command: docker load -i images.tar")
+    print("You do not need to untar the archive as Docker can load it directly.")
+    print("Load the images with the command: docker load -i images.tar")
 
     log('INFO', "Process complete. If there were no errors, the images should be ready for use.")
     print("Process complete. If there were no errors, the images should be ready for use.")